@@ -1,21 +1,54 @@
 import asyncio
 import base64
 import contextlib
+import hmac
 import json
 import os
+import threading
+import uuid
 from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse
 from loguru import logger
 
+from backend import diagnostics
 from backend.pipecat_session import PipecatSession, SessionConfig
+from backend.registry import SessionRegistry
 
 
 load_dotenv()
 
-app = FastAPI(title="Pipecat Deepgram + OpenAI Backend", version="0.1.0")
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.getenv(name)
+    return v if v is not None and v != "" else default
+
+
+watchdog = diagnostics.LoopWatchdog(
+    threshold=float(_env("LOOP_LAG_THRESHOLD_MS", "200") or "200") / 1000,
+)
+_profile_lock = asyncio.Lock()
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop = asyncio.get_running_loop()
+    diagnostics.install_task_factory(loop)
+    if _env("LOOP_WATCHDOG", "1") != "0":
+        watchdog.start()
+    try:
+        yield
+    finally:
+        if watchdog.loop is not None:
+            await watchdog.stop()
+
+
+app = FastAPI(title="Pipecat Deepgram + OpenAI Backend", version="0.1.0", lifespan=lifespan)
+
+# Live sessions of this process; the multi-worker supervisor drains on it.
+sessions = SessionRegistry()
 
 
 @app.get("/healthz")
@@ -23,14 +56,72 @@ def healthz():
     return JSONResponse({"ok": True})
 
 
-def _env(name: str, default: Optional[str] = None) -> Optional[str]:
-    v = os.getenv(name)
-    return v if v is not None and v != "" else default
+def _require_admin(authorization: Optional[str]):
+    token = _env("ADMIN_TOKEN")
+    if not token:
+        # Admin endpoints are disabled unless a token is configured.
+        raise HTTPException(status_code=404)
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+
+
+@app.get("/admin/loop")
+def admin_loop(authorization: Optional[str] = Header(None)):
+    _require_admin(authorization)
+    return JSONResponse({**watchdog.stats(), "pid": os.getpid(), "sessions": sessions.active})
+
+
+@app.get("/admin/profile")
+async def admin_profile(
+    seconds: float = Query(10.0, gt=0, le=60),
+    hz: int = Query(100, ge=1, le=1000),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    authorization: Optional[str] = Header(None),
+):
+    _require_admin(authorization)
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        loop = asyncio.get_running_loop()
+        loop_thread_id = threading.get_ident()
+        profile = await loop.run_in_executor(
+            None,
+            lambda: diagnostics.sample_profile(
+                seconds=seconds,
+                interval=1.0 / hz,
+                loop=loop,
+                loop_thread_id=loop_thread_id,
+            ),
+        )
+
+    if format == "json":
+        return JSONResponse({**profile.summary(), "pid": os.getpid()})
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{os.getpid()}.collapsed"'},
+    )
 
 
 @app.websocket("/ws")
 async def ws(ws: WebSocket):
     await ws.accept()
+    if sessions.draining:
+        # Close after the handshake so the client sees 1013 ("try again later")
+        # rather than an HTTP 403, and reconnects to another worker.
+        await ws.close(code=1013, reason="draining")
+        return
+
+    sessions.opened()
+    try:
+        await _serve_session(ws)
+    finally:
+        sessions.closed()
+
+
+async def _serve_session(ws: WebSocket):
+    diagnostics.bind_session(uuid.uuid4().hex[:12])
 
     cfg = SessionConfig(
         deepgram_api_key=_env("DEEPGRAM_API_KEY", "") or "",
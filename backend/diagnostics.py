@@ -0,0 +1,275 @@
+"""Event-loop lag watchdog and in-process sampling profiler."""
+
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from loguru import logger
+
+
+# Session of the code currently running; copied into every task it creates.
+current_session: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    "current_session", default=None
+)
+
+_task_sessions: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+def bind_session(session_id: str):
+    """Attribute the current task, and every task it creates from now on, to a session."""
+    current_session.set(session_id)
+    task = asyncio.current_task()
+    if task is not None:
+        _task_sessions[task] = session_id
+
+
+def session_of(task: Optional[asyncio.Task]) -> Optional[str]:
+    if task is None:
+        return None
+    return _task_sessions.get(task)
+
+
+def install_task_factory(loop: asyncio.AbstractEventLoop):
+    """Tag new tasks with the session of the code that creates them."""
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        if previous is not None:
+            task = previous(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        session_id = context.get(current_session) if context is not None else current_session.get()
+        if session_id is not None:
+            _task_sessions[task] = session_id
+        return task
+
+    loop.set_task_factory(factory)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+    return label.replace(";", ":")
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _thread_cpu_time(thread_id: int) -> Optional[float]:
+    """CPU seconds used by a thread, where the platform can tell."""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):
+        return None
+
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag continuously.
+
+    A heartbeat task sleeps `interval` seconds at a time and records how late
+    it wakes up. A monitor thread notices when the heartbeat stops while the
+    loop is still blocked, and logs the stack of the stalled code together
+    with the task and session it belongs to.
+    """
+
+    def __init__(self, *, threshold: float = 0.2, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._reported_beat: Optional[float] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    @property
+    def loop_thread_id(self) -> Optional[int]:
+        return self._loop_thread_id
+
+    def start(self):
+        """Start watching the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="loop-watchdog")
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        if self._monitor is not None:
+            self._monitor.join(timeout=1.0)
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stalls,
+        }
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._beat = now
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.stalls += 1
+                logger.warning(f"Event loop was blocked for {lag * 1000:.0f} ms")
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            stalled_for = time.monotonic() - beat - self.interval
+            if stalled_for < self.threshold or self._reported_beat == beat:
+                continue
+            self._reported_beat = beat
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            task_name = task.get_name() if task is not None else None
+            logger.warning(
+                f"Event loop stalled for {stalled_for * 1000:.0f} ms "
+                f"(task={task_name}, session={session_of(task)}):\n"
+                + "".join(traceback.format_stack(frame))
+            )
+
+
+@dataclass
+class Profile:
+    """Result of a sampling run."""
+
+    seconds: float
+    interval: float
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    session_samples: Counter = field(default_factory=Counter)
+    loop_samples: int = 0
+    process_cpu: float = 0.0
+    loop_cpu: Optional[float] = None
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 20) -> dict:
+        """
+        JSON-ready summary. Each session is charged the loop thread's CPU time
+        in proportion to its share of all loop-thread samples; the rest
+        (callbacks, protocol parsing, the selector, tasks of no session) is
+        reported under "unattributed".
+        """
+        attributed = sum(self.session_samples.values())
+        sessions: Dict[str, dict] = {}
+        for session_id, count in self.session_samples.most_common():
+            sessions[session_id] = self._share(count)
+        return {
+            "seconds": self.seconds,
+            "interval": self.interval,
+            "samples": self.samples,
+            "process_cpu_seconds": round(self.process_cpu, 4),
+            "loop_thread_cpu_seconds": round(self.loop_cpu, 4) if self.loop_cpu is not None else None,
+            "loop_samples": self.loop_samples,
+            "sessions": sessions,
+            "unattributed": self._share(self.loop_samples - attributed),
+            "top_stacks": [
+                {"stack": stack, "samples": count} for stack, count in self.stacks.most_common(top)
+            ],
+        }
+
+
+    def _share(self, count: int) -> dict:
+        share = count / self.loop_samples if self.loop_samples else 0.0
+        return {
+            "samples": count,
+            "loop_share": round(share, 4),
+            "cpu_seconds": round(share * self.loop_cpu, 4) if self.loop_cpu is not None else None,
+        }
+
+
+def sample_profile(
+    *,
+    seconds: float,
+    interval: float,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    loop_thread_id: Optional[int] = None,
+) -> Profile:
+    """
+    Sample the stacks of every thread of this process for `seconds`.
+
+    Blocks the calling thread, so run it off the event loop. Stacks are
+    prefixed with their thread and, on the loop thread, with the task being
+    run. Loop samples taken inside a session's task are attributed to it,
+    and the loop thread's CPU time is split by each session's share of all
+    loop-thread samples.
+    """
+    profile = Profile(seconds=seconds, interval=interval)
+    own_id = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+
+    process_start = time.process_time()
+    loop_start = _thread_cpu_time(loop_thread_id) if loop_thread_id is not None else None
+
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            prefix = f"thread:{names.get(thread_id, thread_id)}"
+            if thread_id == loop_thread_id and loop is not None:
+                profile.loop_samples += 1
+                task = asyncio.current_task(loop)
+                if task is not None:
+                    session_id = session_of(task)
+                    if session_id is not None:
+                        profile.session_samples[session_id] += 1
+                    prefix += ";task:" + task.get_name().replace(";", ":")
+            profile.stacks[f"{prefix};{_collapse(frame)}"] += 1
+        profile.samples += 1
+        time.sleep(interval)
+
+    profile.process_cpu = time.process_time() - process_start
+    if loop_start is not None:
+        loop_end = _thread_cpu_time(loop_thread_id)
+        if loop_end is not None:
+            profile.loop_cpu = loop_end - loop_start
+    return profile
@@ -0,0 +1,68 @@
+"""Per-process bookkeeping of live websocket sessions."""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class SessionRegistry:
+    """
+    Counts the live sessions of this process and tracks whether it is draining.
+
+    A draining process refuses new sessions but lets the live ones finish.
+    `publish` is called with the new count on every change, which is how
+    worker processes report to the supervisor.
+    """
+
+    def __init__(self, publish: Optional[Callable[[int], None]] = None):
+        self.publish = publish
+        self._active = 0
+        self._draining = False
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def opened(self):
+        self._active += 1
+        self._notify()
+
+    def closed(self):
+        self._active = max(0, self._active - 1)
+        self._notify()
+
+    def start_draining(self):
+        self._draining = True
+
+    async def wait_idle(
+        self,
+        timeout: float,
+        poll_interval: float = 0.1,
+        abort: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """
+        Wait until no sessions are live.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+            poll_interval: Seconds between checks
+            abort: Optional predicate that ends the wait early when true
+
+        Returns:
+            True if the process went idle, False if the timeout elapsed or
+            `abort` returned true first
+        """
+        deadline = time.monotonic() + timeout
+        while self._active > 0:
+            if time.monotonic() >= deadline or (abort is not None and abort()):
+                return False
+            await asyncio.sleep(poll_interval)
+        return True
+
+    def _notify(self):
+        if self.publish is not None:
+            self.publish(self._active)
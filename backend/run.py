@@ -7,9 +7,24 @@ def main():
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
     log_level = os.getenv("LOG_LEVEL", "info")
+    workers = int(os.getenv("WORKERS", "1"))
+
+    if workers > 1:
+        from backend.supervisor import Supervisor
+
+        Supervisor(
+            host=host,
+            port=port,
+            workers=workers,
+            log_level=log_level,
+            drain_timeout=float(os.getenv("DRAIN_TIMEOUT", "30")),
+            stats_host=os.getenv("SUPERVISOR_HOST", "127.0.0.1"),
+            stats_port=int(os.getenv("SUPERVISOR_PORT", str(port + 1))),
+        ).run()
+        return
+
     uvicorn.run("backend.app:app", host=host, port=port, log_level=log_level, reload=False)
 
 
 if __name__ == "__main__":
     main()
-
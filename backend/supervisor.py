@@ -0,0 +1,275 @@
+"""Multi-process serving: N uvicorn workers on one SO_REUSEPORT address."""
+
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import uvicorn
+from loguru import logger
+
+
+APP = "backend.app:app"
+
+
+def reuseport_socket(host: str, port: int) -> socket.socket:
+    """Bind a listening socket that other workers can bind to as well."""
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("Multi-worker mode requires SO_REUSEPORT, which this platform lacks")
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    uvicorn server that drains before shutting down.
+
+    On SIGTERM/SIGINT it first closes its listening sockets, so the kernel
+    routes new connections to the remaining workers, then waits up to
+    `drain_timeout` seconds for its live sessions to finish before letting
+    uvicorn close whatever is left.
+    """
+
+    def __init__(self, config: uvicorn.Config, *, drain_timeout: float, on_drain=None):
+        super().__init__(config)
+        self.drain_timeout = drain_timeout
+        self.on_drain = on_drain
+
+    async def shutdown(self, sockets: Optional[List[socket.socket]] = None):
+        from backend.app import sessions
+
+        sessions.start_draining()
+        if self.on_drain is not None:
+            self.on_drain()
+
+        for server in self.servers:
+            server.close()
+        for sock in sockets or []:
+            sock.close()
+
+        if sessions.active:
+            logger.info(f"Draining {sessions.active} live session(s), up to {self.drain_timeout}s")
+            # A second Ctrl-C sets force_exit and cuts the drain short.
+            if not await sessions.wait_idle(self.drain_timeout, abort=lambda: self.force_exit):
+                logger.warning(f"Drain ended with {sessions.active} session(s) still live")
+
+        await super().shutdown(sockets=sockets)
+
+
+def _worker_main(slot, host, port, log_level, drain_timeout, session_counts, draining):
+    """Entry point of a worker process."""
+    sock = reuseport_socket(host, port)
+
+    from backend.app import sessions
+
+    def publish(count: int):
+        session_counts[slot] = count
+
+    def on_drain():
+        draining[slot] = 1
+
+    sessions.publish = publish
+
+    config = uvicorn.Config(APP, host=host, port=port, log_level=log_level, reload=False)
+    server = DrainingServer(config, drain_timeout=drain_timeout, on_drain=on_drain)
+    server.run(sockets=[sock])
+
+
+@dataclass
+class _Worker:
+    slot: int
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started_at: float = 0.0
+    restarts: int = 0
+    fast_failures: int = 0
+    restart_at: float = 0.0
+
+
+class Supervisor:
+    """
+    Starts `workers` uvicorn processes and keeps them alive.
+
+    Workers that exit while the supervisor is running are restarted, with an
+    exponential backoff when they keep dying right after start. SIGTERM or
+    SIGINT drains every worker and waits for them to exit. Per-worker session
+    counts are served as JSON on `GET /stats` at `stats_host:stats_port`.
+    """
+
+    # A worker that dies sooner than this after starting counts as crash-looping.
+    MIN_UPTIME = 1.0
+    MAX_BACKOFF = 30.0
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        workers: int,
+        log_level: str = "info",
+        drain_timeout: float = 30.0,
+        stats_host: str = "127.0.0.1",
+        stats_port: int = 8001,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+
+        self.host = host
+        self.port = port
+        self.log_level = log_level
+        self.drain_timeout = drain_timeout
+        self.stats_host = stats_host
+        self.stats_port = stats_port
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._session_counts = self._ctx.Array("i", workers, lock=False)
+        self._draining = self._ctx.Array("b", workers, lock=False)
+        self._workers = [_Worker(slot=i) for i in range(workers)]
+        self._stopping = threading.Event()
+        self._stats_server: Optional[ThreadingHTTPServer] = None
+
+    def run(self):
+        # Fail fast in the supervisor rather than in every worker.
+        reuseport_socket(self.host, self.port).close()
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        self._start_stats_server()
+        logger.info(
+            f"Supervisor {os.getpid()} starting {len(self._workers)} workers on "
+            f"{self.host}:{self.port}; stats on http://{self.stats_host}:{self.stats_port}/stats"
+        )
+        for w in self._workers:
+            self._spawn(w)
+
+        try:
+            while not self._stopping.wait(0.5):
+                self._reap()
+        finally:
+            self._shutdown()
+
+    def stats(self) -> dict:
+        workers = []
+        for w in self._workers:
+            alive = w.process is not None and w.process.is_alive()
+            workers.append(
+                {
+                    "slot": w.slot,
+                    "pid": w.process.pid if alive else None,
+                    "alive": alive,
+                    "sessions": self._session_counts[w.slot] if alive else 0,
+                    "draining": bool(self._draining[w.slot]),
+                    "restarts": w.restarts,
+                    "uptime": round(time.monotonic() - w.started_at, 1) if alive else 0.0,
+                }
+            )
+        return {
+            "workers": workers,
+            "total_sessions": sum(w["sessions"] for w in workers),
+            "stopping": self._stopping.is_set(),
+        }
+
+    def _handle_exit(self, sig, frame):
+        if not self._stopping.is_set():
+            logger.info(f"Supervisor received signal {sig}; draining workers")
+        self._stopping.set()
+
+    def _spawn(self, w: _Worker):
+        self._session_counts[w.slot] = 0
+        self._draining[w.slot] = 0
+        w.process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                w.slot,
+                self.host,
+                self.port,
+                self.log_level,
+                self.drain_timeout,
+                self._session_counts,
+                self._draining,
+            ),
+            name=f"backend-worker-{w.slot}",
+        )
+        w.process.start()
+        w.started_at = time.monotonic()
+        logger.info(f"Started worker {w.slot} (pid {w.process.pid})")
+
+    def _reap(self):
+        now = time.monotonic()
+        for w in self._workers:
+            if w.process is None or w.process.is_alive():
+                continue
+
+            if w.restart_at == 0.0:
+                logger.warning(
+                    f"Worker {w.slot} (pid {w.process.pid}) exited with code {w.process.exitcode}"
+                )
+                self._session_counts[w.slot] = 0
+                if now - w.started_at < self.MIN_UPTIME:
+                    w.fast_failures += 1
+                else:
+                    w.fast_failures = 0
+                backoff = min(2.0 ** w.fast_failures - 1, self.MAX_BACKOFF)
+                w.restart_at = now + backoff
+                if backoff:
+                    logger.warning(f"Worker {w.slot} is crash-looping; restarting in {backoff:.0f}s")
+
+            if now >= w.restart_at:
+                w.restart_at = 0.0
+                w.restarts += 1
+                self._spawn(w)
+
+    def _shutdown(self):
+        for w in self._workers:
+            if w.process is not None and w.process.is_alive():
+                w.process.terminate()
+
+        deadline = time.monotonic() + self.drain_timeout + 5.0
+        for w in self._workers:
+            if w.process is None:
+                continue
+            w.process.join(max(0.0, deadline - time.monotonic()))
+            if w.process.is_alive():
+                logger.warning(f"Worker {w.slot} did not exit in time; killing it")
+                w.process.kill()
+                w.process.join()
+
+        if self._stats_server is not None:
+            self._stats_server.shutdown()
+            self._stats_server.server_close()
+        logger.info("Supervisor stopped")
+
+    def _start_stats_server(self):
+        supervisor = self
+
+        class StatsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/stats":
+                    self.send_error(404)
+                    return
+                body = json.dumps(supervisor.stats()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._stats_server = ThreadingHTTPServer((self.stats_host, self.stats_port), StatsHandler)
+        threading.Thread(
+            target=self._stats_server.serve_forever, name="supervisor-stats", daemon=True
+        ).start()
@@ -34,6 +34,9 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
+        "whisper": [
+            "faster-whisper>=1.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
@@ -0,0 +1,158 @@
+"""
+Tests for the backend FastAPI application.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend import app as backend_app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("LOOP_WATCHDOG", "0")
+    with TestClient(backend_app.app) as client:
+        yield client
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    sessions = backend_app.sessions
+    published = []
+    monkeypatch.setattr(sessions, "publish", published.append)
+    monkeypatch.setattr(sessions, "_draining", False)
+    monkeypatch.setattr(sessions, "_active", 0)
+    monkeypatch.setattr(sessions, "published", published, raising=False)
+    return sessions
+
+
+class TestWebsocket:
+    """Test cases for the /ws endpoint."""
+
+    def test_session_is_counted(self, client, sessions):
+        """Test that a session is counted while open and released on end."""
+        with client.websocket_connect("/ws") as ws:
+            assert ws.receive_json() == {"type": "ready"}
+            assert sessions.active == 1
+            ws.send_json({"type": "end"})
+
+        assert sessions.active == 0
+        assert sessions.published == [1, 0]
+
+    def test_session_released_when_end_fails(self, client, sessions, monkeypatch):
+        """Test that the count is released even if ending the session raises."""
+
+        async def failing_end(self):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(backend_app.PipecatSession, "end", failing_end)
+
+        with pytest.raises(RuntimeError):
+            with client.websocket_connect("/ws") as ws:
+                ws.receive_json()
+                ws.send_json({"type": "end"})
+
+        assert sessions.active == 0
+
+    def test_refuses_new_sessions_while_draining(self, client, sessions):
+        """Test that a draining worker closes new sessions with 1013."""
+        sessions.start_draining()
+
+        with client.websocket_connect("/ws") as ws:
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_json()
+
+        assert exc.value.code == 1013
+        assert sessions.active == 0
+        assert sessions.published == []
+
+
+class TestAdmin:
+    """Test cases for the /admin endpoints."""
+
+    TOKEN = "s3cret"
+
+    @pytest.fixture
+    def admin(self, monkeypatch, client):
+        monkeypatch.setenv("ADMIN_TOKEN", self.TOKEN)
+        return client
+
+    def _auth(self, token=TOKEN):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_disabled_without_token(self, client, monkeypatch):
+        """Test that admin endpoints do not exist unless ADMIN_TOKEN is set."""
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+
+        assert client.get("/admin/loop", headers=self._auth()).status_code == 404
+        assert client.get("/admin/profile", headers=self._auth()).status_code == 404
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {},
+            {"Authorization": "Bearer wrong"},
+            {"Authorization": "Basic s3cret"},
+            {"Authorization": "s3cret"},
+        ],
+    )
+    def test_rejects_bad_credentials(self, admin, headers):
+        """Test that a missing or wrong bearer token is refused."""
+        for path in ("/admin/loop", "/admin/profile?seconds=0.1"):
+            response = admin.get(path, headers=headers)
+            assert response.status_code == 401
+            assert response.headers["WWW-Authenticate"] == "Bearer"
+
+    def test_loop_stats(self, admin):
+        """Test the loop lag statistics endpoint."""
+        response = admin.get("/admin/loop", headers=self._auth())
+
+        assert response.status_code == 200
+        body = response.json()
+        assert {"threshold_ms", "last_lag_ms", "max_lag_ms", "stalls", "pid", "sessions"} <= set(body)
+
+    def test_profile_collapsed(self, admin):
+        """Test that the default profile is a collapsed-stacks download."""
+        response = admin.get("/admin/profile?seconds=0.2&hz=200", headers=self._auth())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "attachment" in response.headers["content-disposition"]
+        line = response.text.splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("thread:")
+        assert int(count) > 0
+
+    def test_profile_json(self, admin):
+        """Test the JSON profile summary."""
+        response = admin.get("/admin/profile?seconds=0.2&format=json", headers=self._auth())
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["samples"] > 0
+        assert {"sessions", "top_stacks", "process_cpu_seconds", "pid"} <= set(body)
+
+    def test_profile_rejects_bad_parameters(self, admin):
+        """Test that the profile duration and format are validated."""
+        assert admin.get("/admin/profile?seconds=61", headers=self._auth()).status_code == 422
+        assert admin.get("/admin/profile?format=svg", headers=self._auth()).status_code == 422
+
+    def test_concurrent_profile_conflicts(self, admin):
+        """Test that only one profile runs at a time."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = executor.submit(
+                admin.get, "/admin/profile?seconds=1", headers=self._auth()
+            )
+            deadline = time.monotonic() + 5
+            while not backend_app._profile_lock.locked():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            second = admin.get("/admin/profile?seconds=0.1", headers=self._auth())
+
+            assert second.status_code == 409
+            assert first.result().status_code == 200
@@ -0,0 +1,113 @@
+"""
+Unit tests for the backend loop watchdog and sampling profiler.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend import diagnostics
+
+
+def _busy(seconds: float):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+class TestLoopWatchdog:
+    """Test cases for LoopWatchdog class."""
+
+    async def test_detects_blocked_loop(self):
+        """Test that a blocking call is recorded as a stall."""
+        watchdog = diagnostics.LoopWatchdog(threshold=0.05, interval=0.01)
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.03)
+            _busy(0.15)
+            await asyncio.sleep(0.03)
+        finally:
+            await watchdog.stop()
+
+        assert watchdog.stalls >= 1
+        assert watchdog.stats()["max_lag_ms"] >= 50
+
+
+class TestSampleProfile:
+    """Test cases for sample_profile."""
+
+    async def test_attributes_samples_to_session(self):
+        """Test that loop samples inside a session's tasks are attributed to it."""
+        loop = asyncio.get_running_loop()
+        previous = loop.get_task_factory()
+        diagnostics.install_task_factory(loop)
+
+        async def session():
+            diagnostics.bind_session("abc")
+            # A task created by the session inherits its id.
+            await asyncio.create_task(asyncio.to_thread(lambda: None))
+            _busy(0.2)
+
+        loop_thread_id = threading.get_ident()
+        try:
+            profiling = loop.run_in_executor(
+                None,
+                lambda: diagnostics.sample_profile(
+                    seconds=0.3, interval=0.005, loop=loop, loop_thread_id=loop_thread_id
+                ),
+            )
+            await asyncio.sleep(0.02)
+            await asyncio.create_task(session())
+            profile = await profiling
+        finally:
+            loop.set_task_factory(previous)
+
+        assert profile.samples > 0
+        assert profile.session_samples["abc"] > 0
+        assert "_busy" in profile.collapsed()
+        summary = profile.summary()
+        assert "abc" in summary["sessions"]
+        assert summary["loop_samples"] == profile.loop_samples
+        session = summary["sessions"]["abc"]
+        unattributed = summary["unattributed"]
+        assert session["samples"] + unattributed["samples"] == profile.loop_samples
+        assert unattributed["samples"] > 0
+        assert session["loop_share"] + unattributed["loop_share"] == pytest.approx(1, abs=1e-3)
+        if summary["loop_thread_cpu_seconds"] is not None:
+            assert session["cpu_seconds"] <= summary["loop_thread_cpu_seconds"]
+            assert session["cpu_seconds"] + unattributed["cpu_seconds"] == pytest.approx(
+                summary["loop_thread_cpu_seconds"], abs=1e-3
+            )
+
+    def test_single_sample_is_not_charged_all_cpu(self):
+        """Test that a session seen once is charged only its share of loop samples."""
+        profile = diagnostics.Profile(seconds=1.0, interval=0.01, loop_samples=100, loop_cpu=0.5)
+        profile.session_samples["abc"] = 1
+
+        summary = profile.summary()
+
+        assert summary["sessions"]["abc"]["cpu_seconds"] == pytest.approx(0.005)
+        assert summary["unattributed"]["samples"] == 99
+        assert summary["unattributed"]["cpu_seconds"] == pytest.approx(0.495)
+
+    async def test_task_outside_session_is_not_attributed(self):
+        """Test that tasks created outside any session are not attributed."""
+        loop = asyncio.get_running_loop()
+        previous = loop.get_task_factory()
+        diagnostics.install_task_factory(loop)
+        try:
+            async def in_session():
+                diagnostics.bind_session("abc")
+                return asyncio.create_task(asyncio.sleep(0))
+
+            inner = await asyncio.create_task(in_session())
+            outside = asyncio.create_task(asyncio.sleep(0))
+            await asyncio.gather(inner, outside)
+        finally:
+            loop.set_task_factory(previous)
+
+        assert diagnostics.session_of(inner) == "abc"
+        assert diagnostics.session_of(outside) is None
+        assert diagnostics.session_of(asyncio.current_task()) is None
@@ -0,0 +1,176 @@
+"""
+Unit tests for the EnginePool class.
+"""
+
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from transcriber_pipecat import EnginePool, STTEngine, TranscriberPipecat, register_engine
+
+
+class CountingEngine(STTEngine):
+    """Records how often it is constructed and called, per process."""
+
+    instances = 0
+    batches = []
+
+    def __init__(self, model, language=None, **options):
+        super().__init__(model, language, **options)
+        CountingEngine.instances += 1
+
+    def transcribe_batch(self, chunks):
+        CountingEngine.batches.append(len(chunks))
+        return [f"{os.getpid()}:{CountingEngine.instances}" for _ in chunks]
+
+
+class ShortEngine(STTEngine):
+    """Returns fewer transcripts than chunks."""
+
+    def transcribe_batch(self, chunks):
+        return chunks[1:]
+
+
+class FailingEngine(STTEngine):
+    """Cannot load its model."""
+
+    def __init__(self, model, language=None, **options):
+        raise RuntimeError("no model")
+
+
+register_engine("counting", CountingEngine)
+
+
+@pytest.fixture(autouse=True)
+def reset_counting_engine():
+    CountingEngine.instances = 0
+    CountingEngine.batches = []
+
+
+class TestEnginePool:
+    """Test cases for EnginePool class."""
+
+    async def test_concurrent_async_calls_share_one_inference_call(self):
+        """Test that concurrent chunks are batched into one transcribe_batch call."""
+        transcriber = TranscriberPipecat(
+            model="async-batch", engine="counting", workers=0, max_batch_size=8
+        )
+
+        texts = await asyncio.gather(
+            *(transcriber.transcribe_audio_async(bytes([i]) * 4) for i in range(5))
+        )
+
+        assert len(texts) == 5
+        assert CountingEngine.batches == [5]
+        assert CountingEngine.instances == 1
+
+    async def test_full_batch_is_sent_without_waiting(self):
+        """Test that reaching max_batch_size flushes a batch right away."""
+        pool = EnginePool(
+            CountingEngine, "full-batch", workers=0, max_batch_size=2, batch_window=60
+        )
+
+        texts = await asyncio.wait_for(
+            asyncio.gather(*(pool.transcribe_async(b"\x00\x00") for _ in range(4))), 5
+        )
+
+        assert len(texts) == 4
+        assert CountingEngine.batches == [2, 2]
+
+    def test_model_loaded_once_per_worker(self):
+        """Test that each worker process constructs the engine once."""
+        pool = EnginePool(CountingEngine, "per-worker", workers=2, max_batch_size=1)
+        try:
+            texts = pool.transcribe_batch([b"\x00\x00"] * 12)
+        finally:
+            pool.close()
+
+        assert len(texts) == 12
+        assert {text.split(":")[1] for text in texts} == {"1"}
+        assert len({text.split(":")[0] for text in texts}) <= 2
+
+    def test_unhashable_engine_options(self):
+        """Test that option values do not have to be hashable."""
+        pool = EnginePool(
+            CountingEngine, "options", workers=0, engine_options={"x": [1], "y": {"z": 2}}
+        )
+        assert len(pool.transcribe(b"\x00\x00")) > 0
+        assert len(pool.transcribe(b"\x00\x00")) > 0
+        assert CountingEngine.instances == 1
+
+    def test_short_result_raises(self):
+        """Test that an engine returning too few transcripts is an error."""
+        pool = EnginePool(ShortEngine, "short", workers=0)
+        with pytest.raises(RuntimeError):
+            pool.transcribe_batch([b"a", b"b"])
+
+    async def test_short_result_fails_every_waiter(self):
+        """Test that every pending async call fails when the batch is short."""
+        pool = EnginePool(ShortEngine, "short", workers=0)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(pool.transcribe_async(bytes([i])) for i in range(3)), return_exceptions=True
+            ),
+            5,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_broken_pool_is_replaced(self):
+        """Test that a pool whose workers cannot load the engine is discarded."""
+        pool = EnginePool(FailingEngine, "broken", workers=1)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                pool.transcribe(b"\x00\x00")
+            assert pool._executor is None
+        finally:
+            pool.close()
+
+    async def test_aclose_does_not_block_the_loop(self):
+        """Test that aclose shuts the workers down off the event loop."""
+        pool = EnginePool(CountingEngine, "aclose", workers=1)
+        await pool.transcribe_async(b"\x00\x00")
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.create_task(tick())
+        await pool.aclose()
+        ticker.cancel()
+
+        assert pool._executor is None
+        assert ticks > 0
+
+    async def test_recovers_after_idle_worker_dies(self):
+        """Test that a worker killed while idle fails waiters, then the pool restarts."""
+        pool = EnginePool(CountingEngine, "killed", workers=1, max_batch_size=2)
+        try:
+            await pool.transcribe_async(b"\x00\x00")
+            for process in list(pool._executor._processes.values()):
+                process.kill()
+                process.join()
+            # Let the executor notice the dead worker.
+            await asyncio.sleep(0.5)
+
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(pool.transcribe_async(b"\x00\x00") for _ in range(2)),
+                    return_exceptions=True,
+                ),
+                5,
+            )
+            assert all(isinstance(result, BrokenProcessPool) for result in results)
+            assert pool._executor is None
+
+            text = await asyncio.wait_for(pool.transcribe_async(b"\x00\x00"), 30)
+            assert text.endswith(":1")
+        finally:
+            await pool.aclose()
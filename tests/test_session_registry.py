@@ -0,0 +1,51 @@
+"""
+Unit tests for the backend SessionRegistry.
+"""
+
+import asyncio
+
+from backend.registry import SessionRegistry
+
+
+class TestSessionRegistry:
+    """Test cases for SessionRegistry class."""
+
+    def test_counts_and_publishes(self):
+        """Test that opening and closing sessions is published."""
+        published = []
+        registry = SessionRegistry(publish=published.append)
+
+        registry.opened()
+        registry.opened()
+        registry.closed()
+
+        assert registry.active == 1
+        assert published == [1, 2, 1]
+
+    def test_closed_never_goes_negative(self):
+        """Test that an unmatched close does not underflow the count."""
+        registry = SessionRegistry()
+        registry.closed()
+        assert registry.active == 0
+
+    async def test_wait_idle(self):
+        """Test that wait_idle returns once the last session closes."""
+        registry = SessionRegistry()
+        registry.opened()
+        registry.start_draining()
+        assert registry.draining is True
+
+        asyncio.get_running_loop().call_later(0.05, registry.closed)
+        assert await registry.wait_idle(timeout=1.0, poll_interval=0.01) is True
+
+    async def test_wait_idle_timeout(self):
+        """Test that wait_idle gives up after the timeout."""
+        registry = SessionRegistry()
+        registry.opened()
+        assert await registry.wait_idle(timeout=0.05, poll_interval=0.01) is False
+
+    async def test_wait_idle_abort(self):
+        """Test that wait_idle stops as soon as abort returns true."""
+        registry = SessionRegistry()
+        registry.opened()
+        assert await registry.wait_idle(timeout=10.0, poll_interval=0.01, abort=lambda: True) is False
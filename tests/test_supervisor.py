@@ -0,0 +1,225 @@
+"""
+Unit tests for the backend Supervisor.
+"""
+
+import asyncio
+import contextlib
+import json
+import time
+
+import pytest
+import uvicorn
+import websockets
+
+from backend import app as backend_app
+from backend.supervisor import DrainingServer, Supervisor, reuseport_socket
+
+
+class FakeProcess:
+    """Stands in for a worker process."""
+
+    _next_pid = 1000
+
+    def __init__(self):
+        FakeProcess._next_pid += 1
+        self.pid = FakeProcess._next_pid
+        self.exitcode = None
+
+    def is_alive(self) -> bool:
+        return self.exitcode is None
+
+    def crash(self, code: int = 1):
+        self.exitcode = code
+
+
+@pytest.fixture
+def supervisor(monkeypatch):
+    supervisor = Supervisor(host="127.0.0.1", port=0, workers=2)
+
+    def spawn(w):
+        supervisor._session_counts[w.slot] = 0
+        supervisor._draining[w.slot] = 0
+        w.process = FakeProcess()
+        w.started_at = time.monotonic()
+
+    monkeypatch.setattr(supervisor, "_spawn", spawn)
+    for w in supervisor._workers:
+        supervisor._spawn(w)
+    return supervisor
+
+
+class TestSupervisor:
+    """Test cases for Supervisor class."""
+
+    def test_rejects_zero_workers(self):
+        """Test that at least one worker is required."""
+        with pytest.raises(ValueError):
+            Supervisor(host="127.0.0.1", port=0, workers=0)
+
+    def test_stats_shape(self, supervisor):
+        """Test the JSON served on /stats."""
+        supervisor._session_counts[0] = 3
+        supervisor._session_counts[1] = 2
+        supervisor._draining[1] = 1
+
+        stats = supervisor.stats()
+
+        assert stats["total_sessions"] == 5
+        assert stats["stopping"] is False
+        assert [w["slot"] for w in stats["workers"]] == [0, 1]
+        worker = stats["workers"][1]
+        assert set(worker) == {"slot", "pid", "alive", "sessions", "draining", "restarts", "uptime"}
+        assert worker["alive"] is True
+        assert worker["sessions"] == 2
+        assert worker["draining"] is True
+        assert worker["pid"] == supervisor._workers[1].process.pid
+
+    def test_dead_worker_reports_no_sessions(self, supervisor):
+        """Test that a dead worker's stale count is not reported."""
+        supervisor._session_counts[0] = 4
+        supervisor._workers[0].process.crash()
+
+        worker = supervisor.stats()["workers"][0]
+
+        assert worker["alive"] is False
+        assert worker["pid"] is None
+        assert worker["sessions"] == 0
+
+    def test_restarts_crashed_worker(self, supervisor):
+        """Test that a worker that ran for a while is restarted immediately."""
+        w = supervisor._workers[0]
+        w.started_at -= supervisor.MIN_UPTIME + 1
+        old = w.process
+        supervisor._session_counts[0] = 4
+        old.crash()
+
+        supervisor._reap()
+
+        assert w.process is not old
+        assert w.process.is_alive()
+        assert w.restarts == 1
+        assert w.fast_failures == 0
+        assert supervisor._session_counts[0] == 0
+        assert supervisor._workers[1].restarts == 0
+
+    def test_crash_loop_backoff(self, supervisor):
+        """Test the exponential backoff of a worker that dies right after start."""
+        w = supervisor._workers[0]
+        backoffs = []
+
+        for _ in range(7):
+            w.process.crash()
+            before = time.monotonic()
+            supervisor._reap()
+            if w.restart_at:
+                backoffs.append(round(w.restart_at - before))
+                # Not restarted until the backoff has elapsed.
+                assert not w.process.is_alive()
+                supervisor._reap()
+                assert not w.process.is_alive()
+                w.restart_at = time.monotonic() - 0.01
+                supervisor._reap()
+            assert w.process.is_alive()
+
+        assert w.fast_failures == 7
+        assert w.restarts == 7
+        assert backoffs == [1, 3, 7, 15, 30, 30, 30]
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    sessions = backend_app.sessions
+    monkeypatch.setattr(sessions, "_draining", False)
+    monkeypatch.setattr(sessions, "_active", 0)
+    monkeypatch.setattr(sessions, "publish", None)
+    return sessions
+
+
+@contextlib.asynccontextmanager
+async def draining_server(drain_timeout: float):
+    """Run a DrainingServer for backend.app on an ephemeral SO_REUSEPORT socket."""
+    sock = reuseport_socket("127.0.0.1", 0)
+    port = sock.getsockname()[1]
+    drained = []
+    config = uvicorn.Config(backend_app.app, lifespan="off", log_level="warning")
+    server = DrainingServer(config, drain_timeout=drain_timeout, on_drain=lambda: drained.append(1))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    try:
+        while not server.started:
+            assert not task.done()
+            await asyncio.sleep(0.01)
+        yield server, task, f"ws://127.0.0.1:{port}/ws", drained
+    finally:
+        server.force_exit = server.should_exit = True
+        await asyncio.wait_for(task, 10)
+
+
+async def _open_session(url: str):
+    client = await websockets.connect(url)
+    assert json.loads(await client.recv()) == {"type": "ready"}
+    return client
+
+
+class TestDrainingServer:
+    """Integration tests for DrainingServer with a live /ws session."""
+
+    async def test_waits_for_live_session(self, sessions):
+        """Test that shutdown refuses new connects and waits for the live session."""
+        published = []
+        sessions.publish = published.append
+
+        async with draining_server(drain_timeout=30) as (server, task, url, drained):
+            client = await _open_session(url)
+            assert sessions.active == 1
+
+            server.should_exit = True
+            while not sessions.draining:
+                await asyncio.sleep(0.01)
+            assert drained == [1]
+
+            # The listener is closed, so new sessions go elsewhere.
+            with pytest.raises(OSError):
+                await websockets.connect(url, open_timeout=2)
+
+            # Still serving the live session.
+            await asyncio.sleep(0.3)
+            assert not task.done()
+            await asyncio.wait_for(await client.ping(), 2)
+
+            await client.send(json.dumps({"type": "end"}))
+            await asyncio.wait_for(task, 5)
+            await client.close()
+
+        assert sessions.active == 0
+        assert published == [1, 0]
+
+    async def test_drain_timeout(self, sessions):
+        """Test that shutdown proceeds once the drain timeout elapses."""
+        async with draining_server(drain_timeout=0.5) as (server, task, url, _):
+            client = await _open_session(url)
+
+            started = time.monotonic()
+            server.should_exit = True
+            await asyncio.wait_for(task, 10)
+            elapsed = time.monotonic() - started
+            await client.close()
+
+        assert 0.5 <= elapsed < 5
+
+    async def test_force_exit_cuts_drain_short(self, sessions):
+        """Test that force_exit (a second Ctrl-C) ends the drain early."""
+        async with draining_server(drain_timeout=30) as (server, task, url, _):
+            client = await _open_session(url)
+
+            server.should_exit = True
+            while not sessions.draining:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)
+            assert not task.done()
+
+            started = time.monotonic()
+            server.force_exit = True
+            await asyncio.wait_for(task, 5)
+            await client.close()
+
+        assert time.monotonic() - started < 5
@@ -73,3 +73,70 @@ class TestTranscriberPipecat:
         
         transcriber = TranscriberPipecat(on_transcription=test_callback)
         assert transcriber.on_transcription is not None
+    
+    def test_auto_engine_never_fabricates_text(self):
+        """Test that the default engine does not fall back to the stub."""
+        received = []
+        transcriber = TranscriberPipecat(workers=0, on_transcription=received.append)
+        if transcriber.engine_cls.__name__ == "FasterWhisperEngine":
+            pytest.skip("faster-whisper is installed")
+        
+        assert transcriber.transcribe_audio(b"\x01\x00" * 100) == ""
+        assert received == []
+    
+    def test_unknown_engine(self):
+        """Test that an unknown engine name is rejected."""
+        with pytest.raises(ValueError):
+            TranscriberPipecat(engine="does-not-exist")
+    
+    def test_stub_engine_is_deterministic(self):
+        """Test that the stub engine returns the same text for the same audio."""
+        transcriber = TranscriberPipecat(engine="stub", language="es", workers=0)
+        
+        first = transcriber.transcribe_audio(b"\x01\x00" * 160)
+        second = transcriber.transcribe_audio(b"\x01\x00" * 160)
+        
+        assert first == second
+        assert first.startswith("stub:base:es:160:")
+        assert transcriber.transcribe_audio(b"") == ""
+    
+    def test_transcribe_batch_in_process_pool(self):
+        """Test batch transcription across worker processes."""
+        transcriber = TranscriberPipecat(engine="stub", workers=2, max_batch_size=2)
+        chunks = [bytes([i]) * 32 for i in range(5)]
+        
+        try:
+            texts = transcriber.transcribe_batch(chunks)
+        finally:
+            transcriber.close()
+        
+        expected = TranscriberPipecat(engine="stub", workers=0).transcribe_batch(chunks)
+        assert texts == expected
+        assert len(set(texts)) == 5
+    
+    async def test_transcribe_audio_async_batches(self):
+        """Test that concurrent async calls are resolved in order and reported."""
+        received = []
+        transcriber = TranscriberPipecat(
+            engine="stub", workers=0, on_transcription=received.append
+        )
+        chunks = [bytes([i]) * 32 for i in range(3)]
+        
+        texts = await asyncio.gather(
+            *(transcriber.transcribe_audio_async(chunk) for chunk in chunks)
+        )
+        
+        assert list(texts) == transcriber.transcribe_batch(chunks)
+        assert received[:3] == list(texts)
+    
+    async def test_stop_shuts_down_workers_when_never_started(self):
+        """Test that stop() and aclose() release the workers without start()."""
+        for shutdown in ("stop", "aclose"):
+            transcriber = TranscriberPipecat(engine="stub", workers=1)
+            await transcriber.transcribe_audio_async(b"\x01\x00" * 16)
+            assert transcriber._pool._executor is not None
+            
+            await getattr(transcriber, shutdown)()
+            
+            assert transcriber._pool._executor is None
+            assert not transcriber.is_running
@@ -8,6 +8,16 @@ the Pipecat conversational AI framework.
 __version__ = "0.1.0"
 __author__ = "Transcriber Pipecat Team"
 
+from .engines import FasterWhisperEngine, NullEngine, STTEngine, StubEngine, register_engine
+from .pool import EnginePool
 from .transcriber import TranscriberPipecat
 
-__all__ = ["TranscriberPipecat"]
+__all__ = [
+    "TranscriberPipecat",
+    "EnginePool",
+    "STTEngine",
+    "NullEngine",
+    "StubEngine",
+    "FasterWhisperEngine",
+    "register_engine",
+]
@@ -0,0 +1,172 @@
+"""
+Local speech-to-text engines.
+
+Every engine takes 16 kHz mono PCM16LE chunks and returns one transcript per
+chunk. Engines are instantiated inside the worker processes of an
+`EnginePool`, so they must be importable top-level classes.
+"""
+
+import zlib
+from typing import Dict, List, Optional, Type
+
+from loguru import logger
+
+
+class STTEngine:
+    """
+    Base class for local speech-to-text engines.
+
+    Subclasses load their model in `__init__` and implement `transcribe_batch`.
+    """
+
+    #: Sample rate, in Hz, of the PCM16LE audio the engine expects.
+    sample_rate = 16000
+
+    #: Run in the calling process even when the pool has workers.
+    in_process = False
+
+    def __init__(self, model: str, language: Optional[str] = None, **options):
+        """
+        Load the engine.
+
+        Args:
+            model: Model name (e.g. tiny, base, small, medium, large)
+            language: Optional language code, None to auto-detect
+            **options: Engine-specific options
+        """
+        self.model = model
+        self.language = language
+        self.options = options
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[str]:
+        """
+        Transcribe several audio chunks in one call.
+
+        Args:
+            chunks: Raw PCM16LE audio chunks
+
+        Returns:
+            One transcript per chunk, in order
+        """
+        raise NotImplementedError
+
+
+class NullEngine(STTEngine):
+    """
+    Engine that transcribes nothing.
+
+    Used by "auto" when no real engine is installed, so callers get empty
+    transcripts rather than made-up text.
+    """
+
+    #: Nothing to load or compute, so there is no point in worker processes.
+    in_process = True
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[str]:
+        return ["" for _ in chunks]
+
+
+class StubEngine(STTEngine):
+    """
+    Deterministic engine for tests.
+
+    The transcript only depends on the model, the language and the audio
+    bytes, and is empty for empty audio.
+    """
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[str]:
+        return [self._transcribe(chunk) for chunk in chunks]
+
+    def _transcribe(self, chunk: bytes) -> str:
+        if not chunk:
+            return ""
+        return (
+            f"stub:{self.model}:{self.language or 'auto'}:"
+            f"{len(chunk) // 2}:{zlib.crc32(chunk):08x}"
+        )
+
+
+class FasterWhisperEngine(STTEngine):
+    """
+    Whisper on CPU through faster-whisper (CTranslate2).
+
+    Options are passed to `faster_whisper.WhisperModel`, except `beam_size`
+    which is passed to `transcribe`. `cpu_threads` defaults to 1 because the
+    pool already runs one engine per core.
+    """
+
+    def __init__(self, model: str, language: Optional[str] = None, **options):
+        super().__init__(model, language, **options)
+
+        from faster_whisper import WhisperModel
+
+        options = dict(options)
+        self._beam_size = options.pop("beam_size", 5)
+        options.setdefault("device", "cpu")
+        options.setdefault("compute_type", "int8")
+        options.setdefault("cpu_threads", 1)
+        self._model = WhisperModel(model, **options)
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[str]:
+        import numpy as np
+
+        texts = []
+        for chunk in chunks:
+            if len(chunk) < 2:
+                texts.append("")
+                continue
+            audio = np.frombuffer(chunk[: len(chunk) // 2 * 2], dtype="<i2")
+            audio = audio.astype(np.float32) / 32768.0
+            segments, _ = self._model.transcribe(
+                audio, language=self.language, beam_size=self._beam_size
+            )
+            texts.append(" ".join(s.text.strip() for s in segments).strip())
+        return texts
+
+
+_ENGINES: Dict[str, Type[STTEngine]] = {
+    "none": NullEngine,
+    "stub": StubEngine,
+    "faster-whisper": FasterWhisperEngine,
+}
+
+
+def register_engine(name: str, engine_cls: Type[STTEngine]):
+    """
+    Make an engine available by name.
+
+    Args:
+        name: Name to pass as `engine` to TranscriberPipecat
+        engine_cls: A top-level STTEngine subclass
+    """
+    _ENGINES[name] = engine_cls
+
+
+def get_engine(name: str) -> Type[STTEngine]:
+    """
+    Resolve an engine name to its class.
+
+    "auto" picks faster-whisper when it is installed. Otherwise it falls back
+    to the engine that returns empty transcripts; the stub engine is only
+    used when asked for by name.
+
+    Raises:
+        ValueError: If no engine is registered under `name`
+    """
+    if name == "auto":
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            logger.warning(
+                "faster-whisper is not installed; transcripts will be empty. "
+                "Install it with: pip install 'transcriber_pipecat[whisper]'"
+            )
+            return NullEngine
+        return FasterWhisperEngine
+
+    try:
+        return _ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown STT engine: {name!r} (available: {', '.join(sorted(_ENGINES))})"
+        ) from None
@@ -0,0 +1,260 @@
+"""
+Process-pool execution of local STT engines.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from .engines import STTEngine
+
+
+# Engines loaded in this process, keyed by (engine, model, language, options).
+_engines: Dict[Tuple, STTEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def _load_engine(
+    engine_cls: Type[STTEngine], model: str, language: Optional[str], options: Dict[str, Any]
+) -> STTEngine:
+    # repr() because option values may be unhashable (e.g. lists).
+    key = (engine_cls, model, language, repr(sorted(options.items())))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = engine_cls(model, language, **options)
+            _engines[key] = engine
+        return engine
+
+
+def _run_batch(
+    engine_cls: Type[STTEngine],
+    model: str,
+    language: Optional[str],
+    options: Dict[str, Any],
+    chunks: List[bytes],
+) -> List[str]:
+    return _load_engine(engine_cls, model, language, options).transcribe_batch(chunks)
+
+
+class EnginePool:
+    """
+    Runs an STT engine in a pool of worker processes.
+
+    Each worker loads the model once, when it starts, and keeps it cached by
+    (model, language). Up to `max_batch_size` chunks are sent to a worker as
+    a single inference call. `workers=0` runs the engine in this process
+    instead, on a background thread.
+    """
+
+    def __init__(
+        self,
+        engine_cls: Type[STTEngine],
+        model: str,
+        language: Optional[str] = None,
+        *,
+        workers: Optional[int] = None,
+        max_batch_size: int = 8,
+        batch_window: float = 0.01,
+        engine_options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the pool. Worker processes are started on first use.
+
+        Args:
+            engine_cls: The STTEngine subclass to run
+            model: Model name passed to the engine
+            language: Optional language code passed to the engine
+            workers: Number of worker processes (default: CPU count, 0: in-process)
+            max_batch_size: Maximum number of chunks per inference call
+            batch_window: Seconds the async API waits to fill a batch
+            engine_options: Extra keyword arguments for the engine
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.engine_cls = engine_cls
+        self.model = model
+        self.language = language
+        if engine_cls.in_process:
+            workers = 0
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.engine_options = dict(engine_options or {})
+
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def transcribe(self, chunk: bytes) -> str:
+        """
+        Transcribe one chunk, blocking until the result is ready.
+        """
+        return self.transcribe_batch([chunk])[0]
+
+    def transcribe_batch(self, chunks: List[bytes]) -> List[str]:
+        """
+        Transcribe several chunks, blocking until all results are ready.
+
+        Chunks are split into batches of `max_batch_size` that run in
+        parallel across the workers.
+        """
+        batches = [
+            chunks[i : i + self.max_batch_size]
+            for i in range(0, len(chunks), self.max_batch_size)
+        ]
+        if self.workers == 0:
+            return [text for batch in batches for text in self._check(batch, self._call(batch))]
+
+        executor = self._get_executor()
+        try:
+            futures = [executor.submit(self._job(batch)) for batch in batches]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+        texts = []
+        for batch, result in zip(batches, results):
+            texts.extend(self._check(batch, result))
+        return texts
+
+    async def transcribe_async(self, chunk: bytes) -> str:
+        """
+        Transcribe one chunk without blocking the event loop.
+
+        Chunks submitted within `batch_window` of each other are batched
+        into a single inference call.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((chunk, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush, loop)
+
+        return await future
+
+    def close(self):
+        """
+        Stop the worker processes, blocking until running inference finishes.
+        The pool restarts them if used again.
+        """
+        executor = self._detach()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    async def aclose(self):
+        """
+        Stop the worker processes without blocking the event loop.
+        """
+        executor = self._detach()
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    def _detach(self) -> Optional[Executor]:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending:
+            if not future.done():
+                future.cancel()
+        self._pending = []
+
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        return executor
+
+    def _discard_executor(self, executor: Executor):
+        # A worker died or failed to load the engine: start afresh next time.
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    @staticmethod
+    def _check(batch: List[bytes], texts: List[str]) -> List[str]:
+        if len(texts) != len(batch):
+            raise RuntimeError(
+                f"STT engine returned {len(texts)} transcripts for {len(batch)} chunks"
+            )
+        return texts
+
+    def _job(self, batch: List[bytes]):
+        return partial(
+            _run_batch, self.engine_cls, self.model, self.language, self.engine_options, batch
+        )
+
+    def _call(self, batch: List[bytes]) -> List[str]:
+        return self._job(batch)()
+
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_load_engine,
+                    initargs=(self.engine_cls, self.model, self.language, self.engine_options),
+                )
+            return self._executor
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        chunks = [chunk for chunk, _ in batch]
+        executor = None if self.workers == 0 else self._get_executor()
+        try:
+            result = loop.run_in_executor(executor, self._job(chunks))
+        except Exception as e:
+            # The pool broke while idle, or was shut down from another thread.
+            if isinstance(e, BrokenProcessPool) and executor is not None:
+                self._discard_executor(executor)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        result.add_done_callback(partial(self._resolve, batch, executor))
+
+    def _resolve(
+        self,
+        batch: List[Tuple[bytes, asyncio.Future]],
+        executor: Optional[Executor],
+        result: asyncio.Future,
+    ):
+        if result.cancelled():
+            for _, future in batch:
+                future.cancel()
+            return
+
+        error = result.exception()
+        texts: List[str] = []
+        if isinstance(error, BrokenProcessPool) and executor is not None:
+            self._discard_executor(executor)
+        elif error is None:
+            try:
+                texts = self._check([chunk for chunk, _ in batch], result.result())
+            except Exception as e:
+                error = e
+
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(texts[i])
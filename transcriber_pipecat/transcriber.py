@@ -3,9 +3,12 @@ Main transcriber module using Pipecat framework.
 """
 
 import asyncio
-from typing import Optional, Callable
+from typing import Any, Callable, Dict, List, Optional
 from loguru import logger
 
+from .engines import get_engine
+from .pool import EnginePool
+
 
 class TranscriberPipecat:
     """
@@ -19,7 +22,11 @@ class TranscriberPipecat:
         self,
         model: str = "base",
         language: Optional[str] = None,
-        on_transcription: Optional[Callable[[str], None]] = None
+        on_transcription: Optional[Callable[[str], None]] = None,
+        engine: str = "auto",
+        workers: Optional[int] = None,
+        max_batch_size: int = 8,
+        engine_options: Optional[Dict[str, Any]] = None
     ):
         """
         Initialize the transcriber.
@@ -28,11 +35,26 @@ class TranscriberPipecat:
             model: The Whisper model to use (tiny, base, small, medium, large)
             language: Optional language code (e.g., 'en', 'es')
             on_transcription: Callback function called with each transcription
+            engine: Local STT engine ("auto", "faster-whisper", "none",
+                "stub" or a registered name)
+            workers: Number of engine processes (default: CPU count, 0: in-process)
+            max_batch_size: Maximum number of chunks per inference call
+            engine_options: Extra keyword arguments for the engine
         """
         self.model = model
         self.language = language
         self.on_transcription = on_transcription
+        self.engine = engine
         self._running = False
+        self.engine_cls = get_engine(engine)
+        self._pool = EnginePool(
+            self.engine_cls,
+            model,
+            language,
+            workers=workers,
+            max_batch_size=max_batch_size,
+            engine_options=engine_options,
+        )
         
         logger.info(f"Initialized TranscriberPipecat with model: {model}")
     
@@ -60,28 +82,80 @@ class TranscriberPipecat:
     
     async def stop(self):
         """
-        Stop the transcription service.
+        Stop the transcription service and shut down the engine worker processes.
         """
-        if not self._running:
+        if self._running:
+            logger.info("Stopping transcription service...")
+            self._running = False
+        else:
             logger.warning("Transcriber is not running")
-            return
         
-        logger.info("Stopping transcription service...")
-        self._running = False
+        await self.aclose()
+    
+    def close(self):
+        """
+        Shut down the engine worker processes.
+        
+        Blocks until running inference finishes; from async code, use
+        `aclose()` instead.
+        """
+        self._pool.close()
+    
+    async def aclose(self):
+        """
+        Shut down the engine worker processes without blocking the event loop.
+        """
+        await self._pool.aclose()
     
     def transcribe_audio(self, audio_data: bytes) -> str:
         """
         Transcribe audio data synchronously.
         
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Raw 16 kHz mono PCM16LE audio bytes
             
         Returns:
             Transcribed text
         """
-        # TODO: Implement actual transcription logic
         logger.debug(f"Transcribing audio chunk of {len(audio_data)} bytes")
-        return ""
+        text = self._pool.transcribe(audio_data)
+        self._emit(text)
+        return text
+    
+    def transcribe_batch(self, chunks: List[bytes]) -> List[str]:
+        """
+        Transcribe several audio chunks synchronously, in parallel.
+        
+        Args:
+            chunks: Raw 16 kHz mono PCM16LE audio chunks
+            
+        Returns:
+            One transcribed text per chunk, in order
+        """
+        texts = self._pool.transcribe_batch(chunks)
+        for text in texts:
+            self._emit(text)
+        return texts
+    
+    async def transcribe_audio_async(self, audio_data: bytes) -> str:
+        """
+        Transcribe audio data without blocking the event loop.
+        
+        Concurrent calls are batched into a single inference call.
+        
+        Args:
+            audio_data: Raw 16 kHz mono PCM16LE audio bytes
+            
+        Returns:
+            Transcribed text
+        """
+        text = await self._pool.transcribe_async(audio_data)
+        self._emit(text)
+        return text
+    
+    def _emit(self, text: str):
+        if text and self.on_transcription is not None:
+            self.on_transcription(text)
     
     @property
     def is_running(self) -> bool: